@@ -4,6 +4,7 @@ import traceback
 import time
 
 from shutil import copyfile
+from itertools import islice
 from datetime import datetime
 from optparse import OptionParser
 from DatasetRecord import DatasetRecord
@@ -22,6 +23,7 @@ class DatasetMigration:
         self.timestr = time.strftime("%Y%d%d_%H%M%S")
         self.logHandler = LogHandler(self.logd + '/dsmigin.out.' + self.timestr)
         self.isPrint = True
+        self.infoBatchSize = 100
 
     def run(self):
         options = self.processOption()
@@ -37,12 +39,14 @@ class DatasetMigration:
         # Try FTP & DSMIGIN
         try:
             if options.ftp:
-                self.downloadDataset(recordList, int(options.number))
+                self.downloadDataset(recordList, int(options.number), int(options.sessions or 1))
             if options.dsmigin:
+                updateDatasetInfo = vsamHandler.updateDatasetInfo
                 for row in recordList:
-                    if row.cols[RecordColumn.DSMIGIN] in ("Y", "C", "F"):
-                        if cmp(row.cols[RecordColumn.DSORG], "VSAM") == 0:
-                            vsamHandler.updateDatasetInfo(row)
+                    cols = row.cols
+                    if cols[RecordColumn.DSMIGIN] in ("Y", "C", "F"):
+                        if cmp(cols[RecordColumn.DSORG], "VSAM") == 0:
+                            updateDatasetInfo(row)
 
                 self.migrateDataset(recordList, options)
 
@@ -82,6 +86,12 @@ class DatasetMigration:
                           help="[Optional] Y: convert & dataset gen, C: trigger convert only",
                           metavar="FLAG")
 
+        parser.add_option("-S", "--sessions",
+                          action="store", # optional because action defaults to "store"
+                          dest="sessions",
+                          help="[Optional] number of parallel ftp sessions for dataset listing",
+                          metavar="INTEGER")
+
         parser.add_option("-W", "--work-directory",
                           action="store", # optional because action defaults to "store"
                           dest="work",
@@ -110,7 +120,7 @@ class DatasetMigration:
         if options.work is None:
             print("Error: -W or --work-directory is missing")
             exit(-1)
-        if options.number is None and options.ftp is "Y":
+        if options.number is None and options.ftp == "Y":
             print("Error: -N or --number is missing")
             exit(-1)
         #if options.dsmigin:
@@ -120,13 +130,19 @@ class DatasetMigration:
         if options.number:
             try:
                 int(options.number)
-            except:
+            except ValueError:
                 print("Error: -N or --number is not numeric")
                 exit(-1)
+        if options.sessions:
+            try:
+                int(options.sessions)
+            except ValueError:
+                print("Error: -S or --sessions is not numeric")
+                exit(-1)
         if options.work:
             try:
                 os.chdir(options.work)
-            except:
+            except OSError:
                 print("Error: -W or --work-directory not accessable for " + options.work )
                 exit(-1)
 
@@ -136,85 +152,114 @@ class DatasetMigration:
 
     def migrateDataset(self, recordList, opt):
         dsmiginObj = DsmiginHandler()
+        dsmigin = dsmiginObj.dsmigin
 
         for row in recordList:
-            if row.cols[RecordColumn.DSMIGIN] in ("Y", "C", "F"):
+            cols = row.cols
+            if cols[RecordColumn.DSMIGIN] in ("Y", "C", "F"):
                 startTime = time.time()
-                returncode = dsmiginObj.dsmigin(row, opt)
+                returncode = dsmigin(row, opt)
                 elapsedTime = time.time() - startTime
 
                 if returncode == 0:
-                    if row.cols[RecordColumn.DSMIGIN] in ("Y", "C"):
-                        row.cols[RecordColumn.DSMIGIN] = "N"
+                    if cols[RecordColumn.DSMIGIN] in ("Y", "C"):
+                        cols[RecordColumn.DSMIGIN] = "N"
 
-                    row.cols[RecordColumn.DSMIGINTIME] = elapsedTime
-                    row.cols[RecordColumn.DSMIGINDATE] = datetime.today().strftime('%Y-%m-%d')
+                    cols[RecordColumn.DSMIGINTIME] = elapsedTime
+                    cols[RecordColumn.DSMIGINDATE] = datetime.today().strftime('%Y-%m-%d')
                 else:
-                    print("migrateDataset RC = "+ str(returncode))
+                    print("migrateDataset RC = %d" % returncode)
                     exit(returncode)
 
-    def downloadDataset(self, recordList, number):
+    def downloadDataset(self, recordList, number, sessions=1):
         numberDownloaded = 0
-        ftpHandler = FTPHandler('')
+        ftpHandler = FTPHandler('', sessions)
+        infoDic = {}
+        writeLog = self.logHandler.writeLog
+        isPrint = self.isPrint
 
-        for row in recordList:
+        for index, row in enumerate(recordList):
             if numberDownloaded >= number:
                 break
 
-            if cmp(row.cols[RecordColumn.IGNORE], "Y") == 0:
-               #print("IGNORE: " + row.cols[RecordColumn.DSN])
-               continue
+            cols = row.cols
+            dsn = cols[RecordColumn.DSN]
+
+            if not self.isFtpTarget(cols):
+                continue
 
-            if cmp(row.cols[RecordColumn.FTP], "N") == 0:
-               #print("FTP: " + row.cols[RecordColumn.DSN])
-               continue
+            # list the upcoming datasets together in a single ftp session
+            if dsn not in infoDic:
+                batchSize = min(self.infoBatchSize, number - numberDownloaded)
+                infoDic.update(ftpHandler.getInfoList(self.getPendingDsnList(recordList, index, batchSize)))
 
-            info = None
-            info = ftpHandler.getInfo(row.cols[RecordColumn.DSN])
+            info = infoDic.get(dsn)
             if info:
                 row.setDirInfo(info)
 
             # Recalling migrated data
-            if cmp("Migrated", row.cols[RecordColumn.VOLSER]) == 0:
-                self.logHandler.writeLog("Recalling Migrated Data: " + row.cols[RecordColumn.DSN], self.isPrint)
+            if cmp("Migrated", cols[RecordColumn.VOLSER]) == 0:
+                writeLog("Recalling Migrated Data: " + dsn, isPrint)
                 #print("Recalling Migrated Data: " + row.cols[RecordColumn.DSN])
-                ftpHandler.recall(row.cols[RecordColumn.DSN])
-
                 info = None
-                info = ftpHandler.getInfo(row.cols[RecordColumn.DSN])
+                info = ftpHandler.recallAndGetInfo(dsn)
                 if info:
                     row.setDirInfo(info)
            
-            if cmp(row.cols[RecordColumn.VOLSER], "Migrated") == 0:
-                self.logHandler.writeLog("Skipping Migrated Data: " + row.cols[RecordColumn.DSN], self.isPrint)
+            if cmp(cols[RecordColumn.VOLSER], "Migrated") == 0:
+                writeLog("Skipping Migrated Data: " + dsn, isPrint)
                 continue
-            if cmp(row.cols[RecordColumn.RECFM], "U") == 0:
-                self.logHandler.writeLog("Skipping RECFM=U Data: " + row.cols[RecordColumn.DSN], self.isPrint)
+            if cmp(cols[RecordColumn.RECFM], "U") == 0:
+                writeLog("Skipping RECFM=U Data: " + dsn, isPrint)
+                continue
+            if cmp(cols[RecordColumn.VOLSER], "Pseudo") == 0:
+                writeLog("Skipping Pseudo directory: " +  dsn, isPrint)
                 continue
-            if cmp(row.cols[RecordColumn.VOLSER], "Pseudo") == 0:
-                self.logHandler.wirteLog("Skipping Pseudo directory: " +  row.cols[RecordColumn.DSN], self.isPrint)
 
-            print("Downloading Data: " + row.cols[RecordColumn.DSN])
+            print("Downloading Data: " + dsn)
             startTime = time.time()
-            returncode = ftpHandler.download(row.cols[RecordColumn.DSN], row.cols[RecordColumn.DSORG], row.cols[RecordColumn.RECFM])
+            returncode = ftpHandler.download(dsn, cols[RecordColumn.DSORG], cols[RecordColumn.RECFM])
             elapsedTime = time.time() - startTime
     
             if returncode == 0:
-                if cmp(row.cols[RecordColumn.FTP], "F") != 0:
-                    row.cols[RecordColumn.FTP] = "N"
-                row.cols[RecordColumn.FTPDATE] = datetime.today().strftime('%Y-%m-%d')
-                row.cols[RecordColumn.FTPTIME] = str(elapsedTime)
+                if cmp(cols[RecordColumn.FTP], "F") != 0:
+                    cols[RecordColumn.FTP] = "N"
+                cols[RecordColumn.FTPDATE] = datetime.today().strftime('%Y-%m-%d')
+                cols[RecordColumn.FTPTIME] = str(elapsedTime)
             elif returncode == 1:
-                self.logHandler.writeLog("Already Downloaded: " + row.cols[RecordColumn.DSN], self.isPrint)
+                writeLog("Already Downloaded: " + dsn, isPrint)
                 continue
             else:
-                self.logHandler.writeLog("Download failed: " + row.cols[RecordColumn.DSN], self.isPrint)
+                writeLog("Download failed: " + dsn, isPrint)
                 continue
 
             numberDownloaded = numberDownloaded + 1
-            self.logHandler.writeLog("Downloaded Dataset: " + row.cols[RecordColumn.DSN] + ' ' + str(numberDownloaded) + '/' + str(number), self.isPrint)
+            writeLog("Downloaded Dataset: %s %d/%d" % (dsn, numberDownloaded, number), isPrint)
+
+        writeLog("Total Downloaded Dataset: %d/%d" % (numberDownloaded, number), isPrint)
+
+    def getPendingDsnList(self, recordList, index, batchSize):
+        dsnList = []
+
+        for row in islice(recordList, index, None):
+            if len(dsnList) >= batchSize:
+                break
+            if self.isFtpTarget(row.cols):
+                dsnList.append(row.cols[RecordColumn.DSN])
+
+        return dsnList
+
+    def isFtpTarget(self, cols):
+        if cmp(cols[RecordColumn.IGNORE], "Y") == 0:
+            return False
+        if cmp(cols[RecordColumn.FTP], "N") == 0:
+            return False
+        # VSAM clusters can not be downloaded
+        if cmp(cols[RecordColumn.DSORG], "VSAM") == 0:
+            return False
+
+        return True
 
-        self.logHandler.writeLog("Total Downloaded Dataset: " + str(numberDownloaded) + "/" + str(number), self.isPrint)
     def loadCSV(self, fileHandler):
         recordList = fileHandler.readRecordList()
         return recordList
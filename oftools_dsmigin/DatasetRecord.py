@@ -24,22 +24,20 @@ class RecordColumn:
                 'KEYOFF', 'KEYLEN', 'MAXLRECL', 'AVGLRECL', 'CISIZE', 'IGNORE', 'FTP', 'FTPDATE',
                 'FTPTIME', 'DSMIGIN', 'DSMIGINDATE', 'DSMIGINTIME']
 
-class DatasetRecord:
+class DatasetRecord(object):
+    __slots__ = ('cols',)
+
     def __init__(self):
 
-        self.cols = []
-        i = 0
-        while i < len(RecordColumn.nameList):
-            self.cols.append("")
-            i = i+1
+        self.cols = [""] * len(RecordColumn.nameList)
 
     def printRecord(self):
-        for i in range(len(self.cols)):
-            print(self.cols[i]) 
+        for col in self.cols:
+            print(col) 
 
     def setColumns(self, cols):
-        for i in range(len(cols)):
-            self.cols[i] = cols[i].replace(" ","")
+        cols = cols[:len(self.cols)]
+        self.cols[:len(cols)] = [col.replace(" ","") for col in cols]
 
     def getColumns(self):
         return self.cols
@@ -50,8 +48,8 @@ class DatasetRecord:
         if len(cols) != len(RecordColumn.nameList):
             error = 1
 
-        for i in range(len(cols)):
-            if cmp(cols[i].strip(), RecordColumn.nameList[i].strip()) != 0:
+        for col, name in zip(cols, RecordColumn.nameList):
+            if cmp(col.strip(), name.strip()) != 0:
                error = 1
                break
 
@@ -64,31 +62,28 @@ class DatasetRecord:
            exit(-1)
       
     def setDirInfo(self, info):
-        infoList = info.split()
-
         # Migrated
-        if cmp("Migrated", infoList[0]) == 0:
-            self.cols[RecordColumn.VOLSER] = infoList[0]
-            if (len(self.cols[RecordColumn.VOLSER]) < 1):
-                return
+        if info.startswith("Migrated "):
+            self.cols[RecordColumn.VOLSER] = "Migrated"
             return
 
         # Pseudo directoy
-        if cmp("Pseudo", infoList[0]) == 0:
-            if (len(self.cols[RecordColumn.VOLSER]) < 1):
-                self.cols[RecordColumn.VOLSER] = infoList[0]
-                return
+        if info.startswith("Pseudo "):
+            if not self.cols[RecordColumn.VOLSER]:
+                self.cols[RecordColumn.VOLSER] = "Pseudo"
             return
 
         # VSAM data does not have VOLSER information
-        if cmp("VSAM", infoList[0]) == 0:
-            self.cols[RecordColumn.DSORG] = infoList[0]
+        if info.startswith("VSAM "):
+            self.cols[RecordColumn.DSORG] = "VSAM"
             return
 
+        infoList = info.split()
+
         # VSAM INDEX & DATA only have 4 columns
         if (len(infoList) == 4):
             if cmp("VSAM", infoList[2]) == 0:
-                if infoList[3].endswith("INDEX") or infoList[3].endswith("DATA"):
+                if infoList[3].endswith(("INDEX", "DATA")):
                     self.cols[RecordColumn.VOLSER] = infoList[0]
                     #UNIT = infoList[1]
                     self.cols[RecordColumn.RECFM] = infoList[2]
@@ -108,10 +103,11 @@ class DatasetRecord:
             #self.cols[RecordColumn.DSORG] = infoList[8]
             #DSN = infoList[9]
 
-            self.cols[RecordColumn.RECFM] = info[33:38].strip()
-            self.cols[RecordColumn.LRECL] = info[39:44].strip()
-            self.cols[RecordColumn.BLKSIZE] = info[45:50].strip()
-            self.cols[RecordColumn.DSORG] = info[51:55].strip()
+            cols = self.cols
+            (cols[RecordColumn.RECFM], cols[RecordColumn.LRECL],
+             cols[RecordColumn.BLKSIZE], cols[RecordColumn.DSORG]) = (
+                info[33:38].strip(), info[39:44].strip(),
+                info[45:50].strip(), info[51:55].strip())
            
         return 
  
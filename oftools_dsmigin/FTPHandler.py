@@ -1,33 +1,62 @@
 import io
 import os
+import re
 import subprocess
 
+from multiprocessing.pool import ThreadPool
+
+# a listing line and its last column (Dsname), quotes stripped
+LISTING_LINE = re.compile(r"^((?:.*[ \t])?'?([^\s']+)'?)[ \t\r]*$", re.M)
+
 class FTPHandler:
-    def __init__(self, ip):
+    def __init__(self, ip, sessions=1):
         self.ip = ip
-
-    def getInfo(self, dsn):
-        commandString = 'lftp -e "cd ..; dir ' + dsn + ';quit;" ' +  self.ip + " "
-        #os.system(commandString)
-        #result = subprocess.check_output(commandString, shell=True)
+        self.sessions = sessions
+        self.downloadHandlers = {
+            "PS": self.downloadPS,
+            "PO": self.downloadPO,
+        }
+
+    def getInfoList(self, dsnList):
+        # list every dataset of the batch in one lftp session
+        infoDic = dict.fromkeys(dsnList)
+        if not dsnList:
+            return infoDic
+
+        # listings are independent, spread them over parallel sessions
+        sessions = min(self.sessions, len(dsnList))
+        if sessions > 1:
+            pool = ThreadPool(sessions)
+            try:
+                outputList = pool.map(self.listDatasets, [dsnList[i::sessions] for i in range(sessions)])
+            finally:
+                pool.close()
+        else:
+            outputList = [self.listDatasets(dsnList)]
+
+        for output in outputList:
+            for line, dsn in LISTING_LINE.findall(output):
+                if dsn in infoDic and infoDic[dsn] is None:
+                    infoDic[dsn] = line
+
+        return infoDic
+
+    def getListingDsn(self, line):
+        match = LISTING_LINE.match(line)
+        if match is None:
+            return None
+
+        return match.group(2)
+
+    def listDatasets(self, dsnList):
+        commandString = 'lftp -e "cd ..; ' + ''.join('dir ' + dsn + '; ' for dsn in dsnList) + 'quit;" ' +  self.ip + " "
         p = subprocess.Popen([commandString], stdout=subprocess.PIPE, shell=True)
-        #p.communicate()
-
-        while True:
-            line = p.stdout.readline()
-            if not line:
-                break
-
-            if dsn in line:
-                return line
-
-        return None
+        return p.communicate()[0]
 
     def download(self, dsn, dsorg, recfm):
-        commandString = ""
         rdwftp = ""
 
-        if recfm[0] is 'V':
+        if recfm[0] == 'V':
             rdwftp = "quote site rdw\n"
 #            rdwftp = ""
 
@@ -35,43 +64,57 @@ class FTPHandler:
             print("VSAM data is not able to download directly")
             return -100
 
-        if cmp(dsorg, "PS") == 0:
-            commandString = 'ftp -i ' + self.ip 
-            ftpcommand = "\nbianry\n" + rdwftp + "\ncd ..\nbinary\nget " + dsn +"\nquit\n"   
-
-            #commandString = 'lftp -e "' + "" + 'cd ..; get -c ' + dsn + ';quit;" ' +  self.ip + " "
-            #p = subprocess.Popen([commandString], stdout=subprocess.PIPE, shell=True)
-            #p.communicate()
-
-            p = subprocess.Popen([commandString], subprocess.PIPE, shell=True)
-            p.communicate(input=b' '+ftpcommand)[0]
+        handler = self.downloadHandlers.get(dsorg)
+        if handler:
+            return handler(dsn, rdwftp)
 
-            return p.returncode
+        return -1
 
-        elif cmp(dsorg, "PO") == 0:
-            if not os.path.exists(dsn):
-                os.makedirs(dsn)
+    def downloadPS(self, dsn, rdwftp):
+        commandString = 'ftp -i ' + self.ip 
+        ftpcommand = "\nbianry\n" + rdwftp + "\ncd ..\nbinary\nget " + dsn +"\nquit\n"   
 
-            os.chdir(dsn)
+        #commandString = 'lftp -e "' + "" + 'cd ..; get -c ' + dsn + ';quit;" ' +  self.ip + " "
+        #p = subprocess.Popen([commandString], stdout=subprocess.PIPE, shell=True)
+        #p.communicate()
 
-            # do not know why but lftp fails on some PDS data
-            #commandString = 'lftp -e "set xfer:clobber yes;cd ../' + dsn + '; mget *;quit;" ' +  self.ip + " "  
-            commandString = 'ftp -i ' + self.ip 
-            ftpcommand = "\nbianry\n" + rdwftp + "\ncd ..\ncd " + dsn + "\nbinary\nmget -c *\nquit\n"   
+        p = subprocess.Popen([commandString], subprocess.PIPE, shell=True)
+        p.communicate(input=b' '+ftpcommand)[0]
 
-            p = subprocess.Popen([commandString], stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
-            p.communicate(input=b' '+ftpcommand)[0]
+        return p.returncode
 
-            os.chdir("..")
-            return p.returncode
+    def downloadPO(self, dsn, rdwftp):
+        if not os.path.exists(dsn):
+            os.makedirs(dsn)
 
-        return -1
+        os.chdir(dsn)
 
-    def recall(self, dsn):
+        # do not know why but lftp fails on some PDS data
+        #commandString = 'lftp -e "set xfer:clobber yes;cd ../' + dsn + '; mget *;quit;" ' +  self.ip + " "  
         commandString = 'ftp -i ' + self.ip 
-        ftpcommand = "\nbianry\ncd ..\ncd " + dsn + "\nquit\n"   
+        ftpcommand = "\nbianry\n" + rdwftp + "\ncd ..\ncd " + dsn + "\nbinary\nmget -c *\nquit\n"   
 
         p = subprocess.Popen([commandString], stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
         p.communicate(input=b' '+ftpcommand)[0]
+
+        os.chdir("..")
         return p.returncode
 
+    def recallAndGetInfo(self, dsn):
+        # cd triggers the recall, dir on the quoted name works from any cwd
+        commandString = 'ftp -i ' + self.ip 
+        ftpcommand = "\nbianry\ncd ..\ncd " + dsn + "\ndir '" + dsn + "'\nquit\n"   
+
+        p = subprocess.Popen([commandString], stdin=subprocess.PIPE, stdout=subprocess.PIPE, shell=True)
+        output = p.communicate(input=b' '+ftpcommand)[0]
+
+        for line in output.splitlines():
+            # skip server replies such as "550 ... not a partitioned data set"
+            if line[:3].isdigit() and line[3:4] in (' ', '-'):
+                continue
+
+            if self.getListingDsn(line) == dsn:
+                return line
+
+        return None
+
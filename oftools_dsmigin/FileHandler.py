@@ -31,14 +31,17 @@ class FileHandler:
         """
         recordList = []
         with open(self.filename) as csvfile:        
-            i = 0
             spamreader = csv.reader(csvfile, delimiter=',')
+
             for row in spamreader:
-                datasetRecord = DatasetRecord()
+                if not row:
+                    continue
+
                 if cmp(row[0].strip(), RecordColumn.nameList[0].strip()) == 0:
-                    datasetRecord.checkHeader(row)
+                    DatasetRecord().checkHeader(row)
                     continue
 
+                datasetRecord = DatasetRecord()
                 datasetRecord.setColumns(row)
                 recordList.append(datasetRecord)
 
@@ -47,13 +50,11 @@ class FileHandler:
     def writeRecordList(self, recordList):
         """
         """
-        with open(self.filename, 'w') as csvfile:
+        with open(self.filename, 'w', 1 << 20) as csvfile:
             spamwriter = csv.writer(csvfile, delimiter=',')
             spamwriter.writerow(RecordColumn.nameList)
+            spamwriter.writerows(record.getColumns() for record in recordList)
 
-            for i in range(len(recordList)):
-                spamwriter.writerow(recordList[i].getColumns())
-                
     def getFilename(self):
         """
         """
@@ -1,81 +1,116 @@
 import os
+import re
+import errno
 import csv
-import os.path
-from os import path
 
 from DatasetRecord import DatasetRecord
 from DatasetRecord import RecordColumn
 
+# listc attribute name and the column its value goes to
+LISTC_ATTRIBUTES = {
+    "RKP": RecordColumn.KEYOFF,
+    "KEYLEN": RecordColumn.KEYLEN,
+    "MAXLRECL": RecordColumn.MAXLRECL,
+    "AVGLRECL": RecordColumn.AVGLRECL,
+    "CISIZE": RecordColumn.CISIZE,
+}
+
+# listc keyword and the VSAM type it implies
+LISTC_VSAM_TYPES = {
+    "INDEXED": "KS",
+}
+
+# NAME-------VALUE pairs and standalone keywords of a listc line
+LISTC_ATTRIBUTE = re.compile(r"(?<![\w-])(%s)-*([^\s-]*)|(?<![\w-])(%s)(?![\w-])" %
+                             ("|".join(LISTC_ATTRIBUTES), "|".join(LISTC_VSAM_TYPES)))
+LISTC_FIELD_COUNT = len(LISTC_ATTRIBUTES) + len(LISTC_VSAM_TYPES)
+
 class VSAMHandler:
     def __init__(self):
-        return
+        self.listcDir = os.path.join(os.getcwd(), '../listc')
+        self.isListcDir = os.path.isdir(self.listcDir)
 
     def removeDataAndIndex(self, recordList):
         recordDic = {}
         for record in recordList:
             recordDic[record.cols[RecordColumn.DSN]] = record;
 
-        for recordName in recordDic:
-            index = recordName+'.INDEX'
+        removeSet = set()
+        # only a cluster with an INDEX companion can be a KSDS to prune
+        for index, indexRecord in recordDic.items():
+            if not index.endswith('.INDEX'):
+                continue
+
+            recordName = index[:-len('.INDEX')]
+            record = recordDic.get(recordName)
+            if record is None:
+                continue
+
             data  = recordName+'.DATA'
-            if recordDic.get(index):
-                if recordDic.get(data):
-                    recordDic.get(recordName).cols[RecordColumn.DSORG] = "VSAM"
-                    recordList.remove(recordDic.get(index))
-                    recordList.remove(recordDic.get(data))
-                    print("remove: " + index)
-                    print("remove: " + data)
+            dataRecord = recordDic.get(data)
+            if dataRecord is None:
+                continue
+
+            record.cols[RecordColumn.DSORG] = "VSAM"
+            removeSet.add(indexRecord)
+            removeSet.add(dataRecord)
+            print("remove: " + index)
+            print("remove: " + data)
+
+        if removeSet:
+            recordList[:] = [record for record in recordList if record not in removeSet]
 
 
     def updateDatasetInfo(self, row):
-        cwd = os.getcwd()
-        os.chdir(os.path.join(cwd,'../listc'))
-    
-        if path.exists(row.cols[RecordColumn.DSN]) == 0:
-            os.chdir(cwd)
+        # without listc files the VSAM cluster can not be defined, abort the run
+        if not self.isListcDir:
+            raise OSError(errno.ENOENT, "listc directory not found", self.listcDir)
+
+        cols = row.cols
+        dsn = cols[RecordColumn.DSN]
+        listcPath = os.path.join(self.listcDir, dsn)
+
+        try:
+            with open(listcPath) as listcfile:
+                listc = listcfile.read()
+        except IOError as error:
+            if error.errno != errno.ENOENT:
+                raise
             return -1
 
-        with open( row.cols[RecordColumn.DSN] ) as listcfile:
-            flag = 0
-            for line in listcfile:
-                if flag == 1:                         
-                    info = line.strip()
-                    info = info.replace("-","")
-                    infoList = info.split(' ')
-                    print(info)
-                    for j in range(len(infoList)):
-                        if infoList[j].startswith("RKP"):
-                            rkp = infoList[j].replace("RKP","")
-                            row.cols[RecordColumn.KEYOFF] = rkp
-                            print("KEYOFF: " + str(rkp))
-                        elif infoList[j].startswith("KEYLEN"):
-                            keylen = infoList[j].replace("KEYLEN","")
-                            row.cols[RecordColumn.KEYLEN] = keylen
-                            print("KEYLEN: " + str(keylen))
-                        elif infoList[j].startswith("MAXLRECL"):
-                            maxlrecl = infoList[j].replace("MAXLRECL","")
-                            row.cols[RecordColumn.MAXLRECL] = maxlrecl
-                            print("MAXLRECL: " + str(maxlrecl))
-                        elif infoList[j].startswith("AVGLRECL"):
-                            avglrecl = infoList[j].replace("AVGLRECL","")
-                            row.cols[RecordColumn.AVGLRECL] = avglrecl
-                            print("AVGLRECL: " + str(avglrecl))
-                        elif infoList[j].startswith("CISIZE"):
-                            cisize = infoList[j].replace("CISIZE","")
-                            row.cols[RecordColumn.CISIZE] = cisize
-                            print("CISIZE: " + str(cisize))
-                        elif infoList[j].startswith("INDEXED"):
-                            vsam = "KS"
-                            row.cols[RecordColumn.VSAM] = vsam
-                            print("VSAM: " + vsam)
-                if line.find("DATA ------- " + row.cols[RecordColumn.DSN]) >= 0:
-                    flag = 1
-                    row.cols[RecordColumn.RECFM] = "VB"
-                if line.find("INDEX ------ " + row.cols[RecordColumn.DSN]) >= 0:            
-                    break      
-
-        os.chdir(cwd)
-        listcfile.close()
+        # only the DATA section, up to the INDEX line, holds the attributes
+        start = listc.find("DATA ------- " + dsn)
+        if start < 0:
+            return 0
+        cols[RecordColumn.RECFM] = "VB"
+
+        start = listc.find("\n", start) + 1 or len(listc)
+        end = listc.find("INDEX ------ " + dsn, start)
+        if end < 0:
+            end = len(listc)
+
+        found = set()
+        updated = []
+        for match in LISTC_ATTRIBUTE.finditer(listc, start, end):
+            name, value, keyword = match.groups()
+            if keyword:
+                vsam = LISTC_VSAM_TYPES[keyword]
+                cols[RecordColumn.VSAM] = vsam
+                updated.append("VSAM: " + vsam)
+                found.add(keyword)
+            else:
+                column = LISTC_ATTRIBUTES[name]
+                cols[column] = value
+                updated.append(RecordColumn.nameList[column] + ": " + value)
+                found.add(name)
+
+            # stop once every attribute we care about has been seen
+            if len(found) == LISTC_FIELD_COUNT:
+                break
+
+        if updated:
+            print(dsn + " " + ", ".join(updated))
+
         return 0
         #if tehre's a listc file on the vsam file we are interested in, open and parse it.
         #update into the recordList